@@ -1,8 +1,10 @@
 """HTTP transport implementation for the datetime MCP server."""
 
 import asyncio
+import itertools
 import json
 import logging
+import math
 import os
 import platform
 import signal
@@ -10,8 +12,8 @@ import sys
 import threading
 import time
 import weakref
-from typing import Any, Dict, Set
-from collections import deque
+from array import array
+from typing import Any, Dict, Iterator, Set
 
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -47,13 +49,66 @@ metrics_lock = threading.Lock()
 MAX_RESPONSE_TIMES = 1000  # Limit response times storage
 MAX_ENDPOINT_TRACKING = 100  # Limit tracked endpoints
 
-# Use deque for efficient memory management
-response_times_deque = deque(maxlen=MAX_RESPONSE_TIMES)
+
+class ResponseTimeBuffer:
+    """Fixed-size ring buffer of response times stored in a C double array.
+
+    Samples are written in place instead of being boxed as Python floats,
+    and a running total keeps the mean O(1) for the health and metrics
+    endpoints.
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._times = array("d", bytes(8 * maxlen))
+        self._next = 0  # Slot the next sample is written to
+        self._count = 0
+        self._total = 0.0
+
+    def append(self, value: float) -> None:
+        """Record a sample, overwriting the oldest one once full."""
+        if self._count == self.maxlen:
+            self._total -= self._times[self._next]
+        else:
+            self._count += 1
+        self._times[self._next] = value
+        self._total += value
+        self._next += 1
+        if self._next == self.maxlen:
+            self._next = 0
+            # Re-sum once per wrap so rounding in the running total can't drift
+            self._total = math.fsum(self._times)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._next = 0
+        self._count = 0
+        self._total = 0.0
+
+    def mean(self) -> float:
+        """Return the mean of the stored samples, or 0 if there are none."""
+        return self._total / self._count if self._count else 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate over samples from oldest to newest."""
+        if self._count < self.maxlen:
+            return iter(self._times[: self._count])
+        return itertools.chain(self._times[self._next :], self._times[: self._next])
+
+    def __contains__(self, value: float) -> bool:
+        return value in self._times[: self._count]
+
+
+# Ring buffer keeps response time storage bounded and allocation-free
+response_times_buffer = ResponseTimeBuffer(MAX_RESPONSE_TIMES)
 
 metrics = {
     "requests_total": 0,
     "requests_by_endpoint": {},
-    "response_times": response_times_deque,
+    "response_times": response_times_buffer,
     "errors_total": 0,
     "start_time": time.time(),
     "concurrent_requests": 0,
@@ -73,7 +128,8 @@ class SSEConnectionManager:
         self.max_connections = max_connections
         self.connections: Set[str] = set()  # Use simple set instead of weak references
         self.lock = threading.Lock()
-        self.connection_timestamps: Dict[str, float] = {}  # Track creation time
+        # Creation times from time.monotonic(); only ever used to compute ages
+        self.connection_timestamps: Dict[str, float] = {}
 
     def add_connection(self, connection_id: str) -> bool:
         """Add a new SSE connection. Returns False if max connections reached."""
@@ -87,9 +143,11 @@ class SSEConnectionManager:
                 )
                 return False
 
-            # Add connection to tracking
+            # Add connection to tracking; re-insert the timestamp so the dict
+            # stays ordered oldest-first even when an id is reused
             self.connections.add(connection_id)
-            self.connection_timestamps[connection_id] = time.time()
+            self.connection_timestamps.pop(connection_id, None)
+            self.connection_timestamps[connection_id] = time.monotonic()
             logger.debug(
                 f"Added SSE connection {connection_id}. Total connections: {len(self.connections)}"
             )
@@ -107,13 +165,17 @@ class SSEConnectionManager:
 
     def _cleanup_old_connections(self) -> None:
         """Clean up connections older than 6 hours."""
-        current_time = time.time()
         max_age = 6 * 3600  # 6 hours in seconds
+        cutoff = time.monotonic() - max_age
 
+        # Monotonic timestamps are kept oldest-first, so expired connections
+        # form a prefix and the scan stops at the first live one instead of
+        # walking every connection on each add or count
         old_connections = []
         for conn_id, timestamp in self.connection_timestamps.items():
-            if current_time - timestamp > max_age:
-                old_connections.append(conn_id)
+            if timestamp >= cutoff:
+                break
+            old_connections.append(conn_id)
 
         for conn_id in old_connections:
             self.connections.discard(conn_id)
@@ -143,26 +205,27 @@ def update_metrics(endpoint: str, process_time: float, is_error: bool = False):
     with metrics_lock:
         metrics["requests_total"] += 1
 
-        # Limit endpoint tracking to prevent memory bloat
-        if len(metrics["requests_by_endpoint"]) >= MAX_ENDPOINT_TRACKING:
-            # Remove least frequently used endpoint
-            min_endpoint = min(
-                metrics["requests_by_endpoint"], key=metrics["requests_by_endpoint"].get
-            )
-            del metrics["requests_by_endpoint"][min_endpoint]
-            logger.debug(
-                f"Removed endpoint {min_endpoint} from tracking due to memory limits"
-            )
+        requests_by_endpoint = metrics["requests_by_endpoint"]
+        count = requests_by_endpoint.get(endpoint)
+        if count is None:
+            count = 0
+            # Limit endpoint tracking to prevent memory bloat; only a new
+            # endpoint can grow the table, so tracked ones skip the O(n) scan
+            if len(requests_by_endpoint) >= MAX_ENDPOINT_TRACKING:
+                # Remove least frequently used endpoint
+                min_endpoint = min(requests_by_endpoint, key=requests_by_endpoint.get)
+                del requests_by_endpoint[min_endpoint]
+                logger.debug(
+                    f"Removed endpoint {min_endpoint} from tracking due to memory limits"
+                )
 
-        metrics["requests_by_endpoint"][endpoint] = (
-            metrics["requests_by_endpoint"].get(endpoint, 0) + 1
-        )
+        requests_by_endpoint[endpoint] = count + 1
 
         if is_error:
             metrics["errors_total"] += 1
 
-        # Use deque for automatic memory management
-        response_times_deque.append(process_time)
+        # Ring buffer overwrites the oldest sample once full
+        response_times_buffer.append(process_time)
 
 
 def tool_to_dict(tool) -> Dict[str, Any]:
@@ -264,11 +327,7 @@ async def health_check():
 
     with metrics_lock:
         # Calculate metrics safely
-        avg_response_time = (
-            sum(metrics["response_times"]) / len(metrics["response_times"])
-            if metrics["response_times"]
-            else 0
-        )
+        avg_response_time = metrics["response_times"].mean()
 
         # Get SSE connection info
         sse_count = sse_manager.get_connection_count()
@@ -313,11 +372,7 @@ async def get_metrics():
     sse_count = sse_manager.get_connection_count()
 
     with metrics_lock:
-        avg_response_time = (
-            sum(metrics["response_times"]) / len(metrics["response_times"])
-            if metrics["response_times"]
-            else 0
-        )
+        avg_response_time = metrics["response_times"].mean()
 
         prometheus_metrics = f"""# HELP datetime_mcp_requests_total Total number of requests
 # TYPE datetime_mcp_requests_total counter
@@ -1,14 +1,16 @@
 import asyncio
 import datetime
 import calendar
+import functools
 import json
+import re
 import zoneinfo
 import signal
 import sys
 import psutil
 import os
 import threading
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, Optional
 from collections import OrderedDict
 import time
 
@@ -65,11 +67,145 @@ def is_shutdown_requested() -> bool:
 
 def update_health_metrics(metric: str, increment: int = 1) -> None:
     """Thread-safe health metrics update."""
+    # Use time.time() instead of asyncio.get_event_loop().time() for thread safety;
+    # read the clock before locking so the lock only guards the dict writes
+    now = int(time.time())
     with health_metrics_lock:
         if metric in health_metrics:
             health_metrics[metric] += increment
-        # Use time.time() instead of asyncio.get_event_loop().time() for thread safety
-        health_metrics["last_health_check"] = int(time.time())
+        health_metrics["last_health_check"] = now
+
+
+def update_health_metrics_batch(increments: Dict[str, int]) -> None:
+    """Thread-safe update of several health metrics under one lock acquisition."""
+    now = int(time.time())
+    with health_metrics_lock:
+        for metric, increment in increments.items():
+            if metric in health_metrics:
+                health_metrics[metric] += increment
+        health_metrics["last_health_check"] = now
+
+
+def store_note(note_name: str, content: str) -> tuple[bool, Optional[str]]:
+    """
+    Thread-safe note insert or update with FIFO eviction at MAX_NOTES.
+
+    The whole check-evict-insert sequence runs under a single notes_lock
+    acquisition; logging is left to the caller so the lock is held only
+    for the dict operations.
+
+    Args:
+        note_name (str): The note name.
+        content (str): The note content.
+
+    Returns:
+        tuple[bool, Optional[str]]: Whether an existing note was updated, and
+            the name of the note evicted to make room (None if none was).
+    """
+    oldest_note = None
+    with notes_lock:
+        is_update = note_name in notes
+        if is_update:
+            # Move to end when updating (maintain access order)
+            notes.move_to_end(note_name)
+        elif notes and len(notes) >= MAX_NOTES:
+            # Remove oldest note if at limit (FIFO with OrderedDict)
+            oldest_note, _ = notes.popitem(last=False)
+        notes[note_name] = content
+    return is_update, oldest_note
+
+
+def notes_bulk_insert(items: Iterable[tuple[str, str]]) -> list[str]:
+    """
+    Thread-safe insert or update of many notes under one notes_lock acquisition.
+
+    The stored notes end up with the same contents as calling store_note
+    for each item: updated and new notes move to the end in batch order and
+    the oldest notes beyond MAX_NOTES are evicted. The work is done with
+    C-level dict operations (one update plus a trim) instead of one
+    Python-level check-evict-insert per note. A name repeated within the
+    batch takes its last position and its last content, as it would with
+    sequential calls.
+
+    The returned eviction list can be shorter than the sequential one.
+    Sequential calls report an existing note that is evicted and then
+    re-added later in the same batch; here that note just moves to the end
+    with its new content and is never reported as evicted.
+
+    Args:
+        items (Iterable[tuple[str, str]]): (note_name, content) pairs, in order.
+
+    Returns:
+        list[str]: Names of the notes no longer stored after the batch, oldest
+            first.
+    """
+    # Re-insert repeated names so each sits at its last position in the batch
+    batch: dict[str, str] = {}
+    for note_name, content in items:
+        batch.pop(note_name, None)
+        batch[note_name] = content
+    evicted_notes = []
+    with notes_lock:
+        # Drop notes being updated so update() re-appends them in batch order
+        for note_name in batch.keys() & notes.keys():
+            del notes[note_name]
+        notes.update(batch)
+        while len(notes) > MAX_NOTES:
+            evicted_notes.append(notes.popitem(last=False)[0])
+    return evicted_notes
+
+
+@functools.lru_cache(maxsize=1)
+def get_available_timezones() -> tuple[str, ...]:
+    """
+    Return the sorted IANA timezone identifiers available on this system.
+
+    The tzdata scan behind zoneinfo.available_timezones() is expensive and its
+    result does not change while the process runs, so it is computed once.
+
+    Returns:
+        tuple[str, ...]: Sorted timezone identifiers.
+    """
+    try:
+        return tuple(sorted(zoneinfo.available_timezones()))
+    except Exception:
+        # Fallback in case zoneinfo is not available
+        return ("UTC", "America/New_York", "Europe/London", "Asia/Tokyo")
+
+
+# DateTime resources are static; only note resources change at runtime
+DATETIME_RESOURCES: tuple[types.Resource, ...] = (
+    types.Resource(
+        uri=AnyUrl("datetime://current"),
+        name="Current DateTime",
+        description="The current date and time",
+        mimeType="text/plain",
+    ),
+    types.Resource(
+        uri=AnyUrl("datetime://today"),
+        name="Today's Date",
+        description="Today's date in ISO format",
+        mimeType="text/plain",
+    ),
+    types.Resource(
+        uri=AnyUrl("datetime://time"),
+        name="Current Time",
+        description="The current time in 24-hour format",
+        mimeType="text/plain",
+    ),
+    types.Resource(
+        uri=AnyUrl("datetime://timezone-info"),
+        name="Timezone Information",
+        description="Current timezone information including UTC offset and DST status",
+        mimeType="application/json",
+    ),
+    types.Resource(
+        uri=AnyUrl("datetime://supported-timezones"),
+        name="Supported Timezones",
+        description="List of all supported timezone identifiers grouped by region",
+        mimeType="application/json",
+    ),
+)
 
 
 @server.list_resources()
@@ -91,41 +227,7 @@ async def handle_list_resources() -> list[types.Resource]:
         for name in notes
     ]
 
-    # DateTime resources
-    datetime_resources = [
-        types.Resource(
-            uri=AnyUrl("datetime://current"),
-            name="Current DateTime",
-            description="The current date and time",
-            mimeType="text/plain",
-        ),
-        types.Resource(
-            uri=AnyUrl("datetime://today"),
-            name="Today's Date",
-            description="Today's date in ISO format",
-            mimeType="text/plain",
-        ),
-        types.Resource(
-            uri=AnyUrl("datetime://time"),
-            name="Current Time",
-            description="The current time in 24-hour format",
-            mimeType="text/plain",
-        ),
-        types.Resource(
-            uri=AnyUrl("datetime://timezone-info"),
-            name="Timezone Information",
-            description="Current timezone information including UTC offset and DST status",
-            mimeType="application/json",
-        ),
-        types.Resource(
-            uri=AnyUrl("datetime://supported-timezones"),
-            name="Supported Timezones",
-            description="List of all supported timezone identifiers grouped by region",
-            mimeType="application/json",
-        ),
-    ]
-
-    return note_resources + datetime_resources
+    return note_resources + list(DATETIME_RESOURCES)
 
 
 @server.read_resource()
@@ -198,16 +300,7 @@ async def handle_read_resource(uri: AnyUrl) -> str:
             return json.dumps(timezone_info, indent=2, default=str)
         elif path == "supported-timezones":
             # Get all available timezones
-            try:
-                all_timezones = sorted(zoneinfo.available_timezones())
-            except Exception:
-                # Fallback in case zoneinfo is not available
-                all_timezones = [
-                    "UTC",
-                    "America/New_York",
-                    "Europe/London",
-                    "Asia/Tokyo",
-                ]
+            all_timezones = get_available_timezones()
 
             # Group timezones by region
             timezone_groups = {}
@@ -264,6 +357,71 @@ async def handle_read_resource(uri: AnyUrl) -> str:
     raise ValueError(f"Unsupported URI scheme: {uri.scheme}")
 
 
+# Prompt catalog is static, so it is built once at import time
+PROMPTS: tuple[types.Prompt, ...] = (
+    types.Prompt(
+        name="summarize-notes",
+        description="Creates a summary of all notes",
+        arguments=[
+            types.PromptArgument(
+                name="style",
+                description="Style of the summary (brief/detailed)",
+                required=False,
+            )
+        ],
+    ),
+    types.Prompt(
+        name="schedule-event",
+        description="Helps schedule an event at a specific time",
+        arguments=[
+            types.PromptArgument(
+                name="event",
+                description="Name of the event to schedule",
+                required=True,
+            ),
+            types.PromptArgument(
+                name="time",
+                description="Time for the event (HH:MM format)",
+                required=True,
+            ),
+        ],
+    ),
+    types.Prompt(
+        name="datetime-calculation-guide",
+        description="Provides examples and guidance on when and how to use date calculation tools",
+        arguments=[
+            types.PromptArgument(
+                name="scenario",
+                description="Specific scenario or use case (optional)",
+                required=False,
+            )
+        ],
+    ),
+    types.Prompt(
+        name="business-day-rules",
+        description="Explains business day calculation rules, weekend patterns, and holiday handling",
+        arguments=[
+            types.PromptArgument(
+                name="region",
+                description="Specific region or country for business day rules (optional)",
+                required=False,
+            )
+        ],
+    ),
+    types.Prompt(
+        name="timezone-best-practices",
+        description="Guidelines for timezone-aware date operations and common pitfalls to avoid",
+        arguments=[
+            types.PromptArgument(
+                name="operation_type",
+                description="Type of operation (calculation/formatting/storage/comparison)",
+                required=False,
+            )
+        ],
+    ),
+)
+
+
 @server.list_prompts()
 async def handle_list_prompts() -> list[types.Prompt]:
     """
@@ -273,68 +431,7 @@ async def handle_list_prompts() -> list[types.Prompt]:
     Returns:
         list[types.Prompt]: List of available prompts.
     """
-    return [
-        types.Prompt(
-            name="summarize-notes",
-            description="Creates a summary of all notes",
-            arguments=[
-                types.PromptArgument(
-                    name="style",
-                    description="Style of the summary (brief/detailed)",
-                    required=False,
-                )
-            ],
-        ),
-        types.Prompt(
-            name="schedule-event",
-            description="Helps schedule an event at a specific time",
-            arguments=[
-                types.PromptArgument(
-                    name="event",
-                    description="Name of the event to schedule",
-                    required=True,
-                ),
-                types.PromptArgument(
-                    name="time",
-                    description="Time for the event (HH:MM format)",
-                    required=True,
-                ),
-            ],
-        ),
-        types.Prompt(
-            name="datetime-calculation-guide",
-            description="Provides examples and guidance on when and how to use date calculation tools",
-            arguments=[
-                types.PromptArgument(
-                    name="scenario",
-                    description="Specific scenario or use case (optional)",
-                    required=False,
-                )
-            ],
-        ),
-        types.Prompt(
-            name="business-day-rules",
-            description="Explains business day calculation rules, weekend patterns, and holiday handling",
-            arguments=[
-                types.PromptArgument(
-                    name="region",
-                    description="Specific region or country for business day rules (optional)",
-                    required=False,
-                )
-            ],
-        ),
-        types.Prompt(
-            name="timezone-best-practices",
-            description="Guidelines for timezone-aware date operations and common pitfalls to avoid",
-            arguments=[
-                types.PromptArgument(
-                    name="operation_type",
-                    description="Type of operation (calculation/formatting/storage/comparison)",
-                    required=False,
-                )
-            ],
-        ),
-    ]
+    return list(PROMPTS)
 
 
 @server.get_prompt()
@@ -862,540 +959,515 @@ get-current-datetime(format="iso", timezone="Invalid/Timezone")
     raise ValueError(f"Unknown prompt: {name}")
 
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """
-    List available tools.
-    Each tool specifies its arguments using JSON Schema validation.
-
-    Returns:
-        list[types.Tool]: List of available tools.
-    """
-    return [
-        types.Tool(
-            name="add-note",
-            description="Add a new note",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string"},
-                    "content": {"type": "string"},
-                },
-                "required": ["name", "content"],
+# Tool catalog is static, so it is built once at import time
+TOOLS: tuple[types.Tool, ...] = (
+    types.Tool(
+        name="add-note",
+        description="Add a new note",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "content": {"type": "string"},
             },
-        ),
-        types.Tool(
-            name="get-note",
-            description="Retrieve a note by name",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the note to retrieve",
-                    },
+            "required": ["name", "content"],
+        },
+    ),
+    types.Tool(
+        name="get-note",
+        description="Retrieve a note by name",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the note to retrieve",
                 },
-                "required": ["name"],
             },
-        ),
-        types.Tool(
-            name="list-notes",
-            description="List all available notes",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "additionalProperties": False,
-            },
-        ),
-        types.Tool(
-            name="delete-note",
-            description="Delete a note by name",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the note to delete",
-                    },
+            "required": ["name"],
+        },
+    ),
+    types.Tool(
+        name="list-notes",
+        description="List all available notes",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "additionalProperties": False,
+        },
+    ),
+    types.Tool(
+        name="delete-note",
+        description="Delete a note by name",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the note to delete",
                 },
-                "required": ["name"],
             },
-        ),
-        types.Tool(
-            name="get-current-datetime",
-            description="Get the current date and time in various formats with timezone support",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format": {
-                        "type": "string",
-                        "enum": [
-                            "iso",
-                            "readable",
-                            "unix",
-                            "rfc3339",
-                            "json",
-                            "custom",
-                        ],
-                        "description": "Format to return the datetime in",
-                    },
-                    "timezone": {
-                        "type": "string",
-                        "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC'). Default: local system timezone",
-                    },
-                    "custom_format": {
-                        "type": "string",
-                        "description": "Custom format string (required when format='custom'). Use Python strftime format codes",
-                    },
+            "required": ["name"],
+        },
+    ),
+    types.Tool(
+        name="get-current-datetime",
+        description="Get the current date and time in various formats with timezone support",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "enum": [
+                        "iso",
+                        "readable",
+                        "unix",
+                        "rfc3339",
+                        "json",
+                        "custom",
+                    ],
+                    "description": "Format to return the datetime in",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC'). Default: local system timezone",
+                },
+                "custom_format": {
+                    "type": "string",
+                    "description": "Custom format string (required when format='custom'). Use Python strftime format codes",
                 },
-                "required": ["format"],
             },
-        ),
-        types.Tool(
-            name="format-date",
-            description="Format a date string according to the specified format",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "date": {
-                        "type": "string",
-                        "description": "Date string to format (default: today)",
-                    },
-                    "format": {
-                        "type": "string",
-                        "description": "Format string (e.g., '%Y-%m-%d %H:%M:%S')",
-                    },
+            "required": ["format"],
+        },
+    ),
+    types.Tool(
+        name="format-date",
+        description="Format a date string according to the specified format",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "Date string to format (default: today)",
+                },
+                "format": {
+                    "type": "string",
+                    "description": "Format string (e.g., '%Y-%m-%d %H:%M:%S')",
                 },
-                "required": ["format"],
             },
-        ),
-        types.Tool(
-            name="calculate-date",
-            description="Add or subtract time from a given date",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_date": {
-                        "type": "string",
-                        "description": "Base date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "operation": {
-                        "type": "string",
-                        "enum": ["add", "subtract"],
-                        "description": "Whether to add or subtract time",
-                    },
-                    "amount": {
-                        "type": "integer",
-                        "minimum": 0,
-                        "description": "Amount of time units to add/subtract",
-                    },
-                    "unit": {
-                        "type": "string",
-                        "enum": ["days", "weeks", "months", "years"],
-                        "description": "Unit of time to add/subtract",
-                    },
-                    "timezone": {
-                        "type": "string",
-                        "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC')",
-                    },
+            "required": ["format"],
+        },
+    ),
+    types.Tool(
+        name="calculate-date",
+        description="Add or subtract time from a given date",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "base_date": {
+                    "type": "string",
+                    "description": "Base date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+                },
+                "operation": {
+                    "type": "string",
+                    "enum": ["add", "subtract"],
+                    "description": "Whether to add or subtract time",
+                },
+                "amount": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Amount of time units to add/subtract",
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["days", "weeks", "months", "years"],
+                    "description": "Unit of time to add/subtract",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC')",
                 },
-                "required": ["base_date", "operation", "amount", "unit"],
             },
-        ),
-        types.Tool(
-            name="calculate-date-range",
-            description="Calculate start and end dates for a period relative to a base date",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "base_date": {
-                        "type": "string",
-                        "description": "Base date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "direction": {
-                        "type": "string",
-                        "enum": ["last", "next"],
-                        "description": "Direction from base date: 'last' for past periods, 'next' for future periods",
-                    },
-                    "amount": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "description": "Amount of time units for the range",
-                    },
-                    "unit": {
-                        "type": "string",
-                        "enum": ["days", "weeks", "months", "years"],
-                        "description": "Unit of time for the range",
-                    },
-                    "timezone": {
-                        "type": "string",
-                        "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC')",
-                    },
+            "required": ["base_date", "operation", "amount", "unit"],
+        },
+    ),
+    types.Tool(
+        name="calculate-date-range",
+        description="Calculate start and end dates for a period relative to a base date",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "base_date": {
+                    "type": "string",
+                    "description": "Base date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+                },
+                "direction": {
+                    "type": "string",
+                    "enum": ["last", "next"],
+                    "description": "Direction from base date: 'last' for past periods, 'next' for future periods",
+                },
+                "amount": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Amount of time units for the range",
+                },
+                "unit": {
+                    "type": "string",
+                    "enum": ["days", "weeks", "months", "years"],
+                    "description": "Unit of time for the range",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC')",
                 },
-                "required": ["base_date", "direction", "amount", "unit"],
             },
-        ),
-        types.Tool(
-            name="calculate-business-days",
-            description="Calculate the number of business days between two dates, excluding weekends and holidays",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS), inclusive",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS), inclusive",
-                    },
-                    "holidays": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional array of holiday dates in ISO format (YYYY-MM-DD) to exclude from business day count",
-                    },
-                    "timezone": {
-                        "type": "string",
-                        "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC')",
-                    },
+            "required": ["base_date", "direction", "amount", "unit"],
+        },
+    ),
+    types.Tool(
+        name="calculate-business-days",
+        description="Calculate the number of business days between two dates, excluding weekends and holidays",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS), inclusive",
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "End date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS), inclusive",
+                },
+                "holidays": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional array of holiday dates in ISO format (YYYY-MM-DD) to exclude from business day count",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Optional timezone identifier (e.g., 'America/New_York', 'UTC')",
                 },
-                "required": ["start_date", "end_date"],
             },
-        ),
-        types.Tool(
-            name="get-current-time",
-            description="Get the current time in various formats",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format": {
-                        "type": "string",
-                        "enum": ["iso", "readable", "unix", "rfc3339"],
-                        "description": "Format to return the time in",
-                    },
-                    "timezone": {
-                        "type": "string",
-                        "description": "Optional timezone (default: local system timezone)",
-                    },
+            "required": ["start_date", "end_date"],
+        },
+    ),
+    types.Tool(
+        name="get-current-time",
+        description="Get the current time in various formats",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "enum": ["iso", "readable", "unix", "rfc3339"],
+                    "description": "Format to return the time in",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Optional timezone (default: local system timezone)",
                 },
-                "required": ["format"],
             },
-        ),
-    ]
+            "required": ["format"],
+        },
+    ),
+)
 
 
-@server.call_tool()
-async def handle_call_tool(
-    name: str, arguments: dict | None
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
     """
-    Enhanced tool execution handler with comprehensive error handling and logging.
-    Tools can modify server state and notify clients of changes.
-
-    Args:
-        name (str): The name of the tool to execute.
-        arguments (dict | None): The arguments for the tool.
+    List available tools.
+    Each tool specifies its arguments using JSON Schema validation.
 
     Returns:
-        list[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
-            The result of the tool execution.
-
-    Raises:
-        ValueError: If the tool name is unknown or arguments are invalid.
+        list[types.Tool]: List of available tools.
     """
-    # Log the tool call
-    start_time = asyncio.get_event_loop().time()
-    logger.debug(f"Tool call: {name} with args: {arguments}")
+    return list(TOOLS)
 
-    if name == "add-note":
-        try:
-            if not arguments:
-                raise ValueError("Missing arguments")
 
-            note_name = arguments.get("name")
-            content = arguments.get("content")
+async def _handle_add_note(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Add or update a note, evicting the oldest note when storage is full."""
+    try:
+        if not arguments:
+            raise ValueError("Missing arguments")
 
-            if not note_name or not content:
-                raise ValueError("Missing name or content")
+        note_name = arguments.get("name")
+        content = arguments.get("content")
 
-            # Input validation
-            if not isinstance(note_name, str) or not isinstance(content, str):
-                raise ValueError("Name and content must be strings")
+        if not note_name or not content:
+            raise ValueError("Missing name or content")
 
-            # Sanitize and validate note name
-            note_name = note_name.strip()
-            if not note_name:
-                raise ValueError("Note name cannot be empty or only whitespace")
+        # Input validation
+        if not isinstance(note_name, str) or not isinstance(content, str):
+            raise ValueError("Name and content must be strings")
 
-            if len(note_name) > 255:
-                raise ValueError("Note name too long (maximum 255 characters)")
+        # Sanitize and validate note name
+        note_name = note_name.strip()
+        if not note_name:
+            raise ValueError("Note name cannot be empty or only whitespace")
 
-            # Check content size
-            content_size = len(content.encode("utf-8"))
-            if content_size > MAX_NOTE_SIZE:
-                raise ValueError(
-                    f"Note content too large ({content_size} bytes). Maximum size is {MAX_NOTE_SIZE} bytes ({MAX_NOTE_SIZE // 1024}KB)"
-                )
+        if len(note_name) > 255:
+            raise ValueError("Note name too long (maximum 255 characters)")
 
-            # Thread-safe note operations
-            with notes_lock:
-                # Check note count limit (thread-safe)
-                if note_name not in notes and len(notes) >= MAX_NOTES:
-                    # Remove oldest note if at limit (FIFO with OrderedDict)
-                    if notes:
-                        oldest_note, _ = notes.popitem(last=False)
-                        logger.warning(
-                            f"Note storage full, removed oldest note: '{oldest_note}'"
-                        )
-                        update_health_metrics("note_storage_warnings")
+        # Check content size
+        content_size = len(content.encode("utf-8"))
+        if content_size > MAX_NOTE_SIZE:
+            raise ValueError(
+                f"Note content too large ({content_size} bytes). Maximum size is {MAX_NOTE_SIZE} bytes ({MAX_NOTE_SIZE // 1024}KB)"
+            )
 
-                # Update server state
-                is_update = note_name in notes
-                notes[note_name] = content
+        # Thread-safe note operations
+        is_update, oldest_note = store_note(note_name, content)
+        if oldest_note is not None:
+            logger.warning(f"Note storage full, removed oldest note: '{oldest_note}'")
+            update_health_metrics("note_storage_warnings")
 
-                # Move to end if updating (maintain access order)
-                if is_update:
-                    notes.move_to_end(note_name)
+        # Log the operation
+        action = "Updated" if is_update else "Added"
+        logger.info(f"{action} note '{note_name}' (size: {content_size} bytes)")
 
-            # Log the operation
-            action = "Updated" if is_update else "Added"
-            logger.info(f"{action} note '{note_name}' (size: {content_size} bytes)")
+        # Notify clients that resources have changed - only if in a request context
+        try:
+            await server.request_context.session.send_resource_list_changed()
+        except LookupError:
+            # Running outside of a request context (e.g., in tests)
+            logger.debug(
+                "Resource list change notification skipped (no request context)"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send resource list change notification: {e}")
 
-            # Notify clients that resources have changed - only if in a request context
-            try:
-                await server.request_context.session.send_resource_list_changed()
-            except LookupError:
-                # Running outside of a request context (e.g., in tests)
-                logger.debug(
-                    "Resource list change notification skipped (no request context)"
-                )
-            except Exception as e:
-                logger.warning(f"Failed to send resource list change notification: {e}")
+        # Thread-safe note count access
+        with notes_lock:
+            note_count = len(notes)
 
-            # Thread-safe note count access
-            with notes_lock:
-                note_count = len(notes)
+        return [
+            types.TextContent(
+                type="text",
+                text=f"{action} note '{note_name}' with {len(content)} characters. Total notes: {note_count}/{MAX_NOTES}",
+            )
+        ]
+
+    except ValueError as e:
+        logger.warning(f"Invalid add-note request: {e}")
+        return [
+            types.TextContent(
+                type="text",
+                text=f"Error adding note: {str(e)}",
+            )
+        ]
+    except Exception as e:
+        logger.error(f"Unexpected error in add-note: {e}", exc_info=True)
+        update_health_metrics("error_recovery_count")
+        return [
+            types.TextContent(
+                type="text",
+                text=f"Internal error while adding note: {str(e)}",
+            )
+        ]
 
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"{action} note '{note_name}' with {len(content)} characters. Total notes: {note_count}/{MAX_NOTES}",
-                )
-            ]
 
-        except ValueError as e:
-            logger.warning(f"Invalid add-note request: {e}")
+async def _handle_get_note(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Return the content of a single note."""
+    if not arguments:
+        raise ValueError("Missing arguments")
+
+    note_name = arguments.get("name")
+
+    if not note_name:
+        raise ValueError("Missing name argument")
+
+    # Thread-safe note access
+    with notes_lock:
+        if note_name in notes:
+            note_content = notes[note_name]
+            # Update access order
+            notes.move_to_end(note_name)
             return [
                 types.TextContent(
                     type="text",
-                    text=f"Error adding note: {str(e)}",
+                    text=note_content,
                 )
             ]
-        except Exception as e:
-            logger.error(f"Unexpected error in add-note: {e}", exc_info=True)
-            update_health_metrics("error_recovery_count")
+        else:
             return [
                 types.TextContent(
                     type="text",
-                    text=f"Internal error while adding note: {str(e)}",
+                    text=f"Note '{note_name}' not found",
                 )
             ]
 
-    elif name == "get-note":
-        if not arguments:
-            raise ValueError("Missing arguments")
 
-        note_name = arguments.get("name")
+async def _handle_list_notes(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Return all notes as a JSON array."""
+    # Thread-safe note listing
+    with notes_lock:
+        if not notes:
+            return [types.TextContent(type="text", text=json.dumps([], indent=2))]
 
-        if not note_name:
-            raise ValueError("Missing name argument")
+        note_list = [
+            {"name": name, "content": content} for name, content in notes.items()
+        ]
 
-        # Thread-safe note access
-        with notes_lock:
-            if note_name in notes:
-                note_content = notes[note_name]
-                # Update access order
-                notes.move_to_end(note_name)
-                return [
-                    types.TextContent(
-                        type="text",
-                        text=note_content,
-                    )
-                ]
-            else:
-                return [
-                    types.TextContent(
-                        type="text",
-                        text=f"Note '{note_name}' not found",
-                    )
-                ]
+    return [types.TextContent(type="text", text=json.dumps(note_list, indent=2))]
 
-    elif name == "list-notes":
-        # Thread-safe note listing
-        with notes_lock:
-            if not notes:
-                return [types.TextContent(type="text", text=json.dumps([], indent=2))]
 
-            note_list = [
-                {"name": name, "content": content} for name, content in notes.items()
-            ]
+async def _handle_delete_note(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Delete a note by name."""
+    if not arguments:
+        raise ValueError("Missing arguments")
 
-        return [types.TextContent(type="text", text=json.dumps(note_list, indent=2))]
+    note_name = arguments.get("name")
 
-    elif name == "delete-note":
-        if not arguments:
-            raise ValueError("Missing arguments")
+    if not note_name:
+        raise ValueError("Missing name argument")
 
-        note_name = arguments.get("name")
+    # Thread-safe note deletion
+    with notes_lock:
+        if note_name in notes:
+            del notes[note_name]
+            note_found = True
+        else:
+            note_found = False
 
-        if not note_name:
-            raise ValueError("Missing name argument")
+    if note_found:
+        # Notify clients that resources have changed - only if in a request context
+        try:
+            await server.request_context.session.send_resource_list_changed()
+        except LookupError:
+            # Running outside of a request context (e.g., in tests)
+            pass
+
+        return [
+            types.TextContent(
+                type="text",
+                text=f"Note '{note_name}' deleted successfully",
+            )
+        ]
+    else:
+        return [
+            types.TextContent(
+                type="text",
+                text=f"Note '{note_name}' not found",
+            )
+        ]
 
-        # Thread-safe note deletion
-        with notes_lock:
-            if note_name in notes:
-                del notes[note_name]
-                note_found = True
-            else:
-                note_found = False
 
-        if note_found:
-            # Notify clients that resources have changed - only if in a request context
-            try:
-                await server.request_context.session.send_resource_list_changed()
-            except LookupError:
-                # Running outside of a request context (e.g., in tests)
-                pass
+async def _handle_get_current_datetime(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Return the current date and time in the requested format."""
+    if not arguments:
+        raise ValueError("Missing arguments")
+
+    time_format = arguments.get("format")
+    timezone_str = arguments.get("timezone")
+    custom_format = arguments.get("custom_format")
 
+    if not time_format:
+        raise ValueError("Missing format argument")
+
+    # Validate custom format requirement
+    if time_format == "custom" and not custom_format:
+        raise ValueError("custom_format is required when format='custom'")
+
+    # Handle timezone if provided, otherwise use system timezone
+    if timezone_str:
+        try:
+            tz = zoneinfo.ZoneInfo(timezone_str)
+            now = datetime.datetime.now(tz)
+        except zoneinfo.ZoneInfoNotFoundError:
             return [
                 types.TextContent(
                     type="text",
-                    text=f"Note '{note_name}' deleted successfully",
+                    text=f"Invalid timezone identifier: '{timezone_str}'. Please use a valid timezone like 'UTC', 'America/New_York', etc. Using system timezone instead.",
                 )
             ]
-        else:
+        except Exception as e:
             return [
                 types.TextContent(
                     type="text",
-                    text=f"Note '{note_name}' not found",
+                    text=f"Error with timezone '{timezone_str}': {str(e)}. Using system timezone instead.",
                 )
             ]
+    else:
+        now = datetime.datetime.now()
 
-    elif name == "get-current-datetime":
-        if not arguments:
-            raise ValueError("Missing arguments")
+    # Format the datetime
+    try:
+        if time_format == "custom":
+            if custom_format:
+                formatted_time = now.strftime(custom_format)
+            else:
+                raise ValueError("custom_format is required when format='custom'")
+        elif time_format == "json":
+            # Return JSON format with multiple representations
+            json_output = {
+                "iso": now.isoformat(),
+                "readable": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "unix": int(now.timestamp()),
+                "rfc3339": now.strftime("%Y-%m-%dT%H:%M:%S%z")
+                if now.tzinfo
+                else now.strftime("%Y-%m-%dT%H:%M:%S"),
+                "timezone": str(now.tzinfo) if now.tzinfo else "Local",
+                "utc_offset": str(now.utcoffset()) if now.utcoffset() else "Unknown",
+            }
+            formatted_time = json.dumps(json_output, indent=2)
+        else:
+            formatted_time = format_time(now, time_format)
 
-        time_format = arguments.get("format")
-        timezone_str = arguments.get("timezone")
-        custom_format = arguments.get("custom_format")
+        return [types.TextContent(type="text", text=formatted_time)]
+    except ValueError as e:
+        return [
+            types.TextContent(type="text", text=f"Error formatting datetime: {str(e)}")
+        ]
 
-        if not time_format:
-            raise ValueError("Missing format argument")
 
-        # Validate custom format requirement
-        if time_format == "custom" and not custom_format:
-            raise ValueError("custom_format is required when format='custom'")
+async def _handle_get_current_time(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Return the current time in the requested format."""
+    if not arguments:
+        raise ValueError("Missing arguments")
+
+    time_format = arguments.get("format")
+    timezone_str = arguments.get("timezone")
+
+    if not time_format:
+        raise ValueError("Missing format argument")
 
-        # Handle timezone if provided, otherwise use system timezone
-        if timezone_str:
+    # Handle timezone if provided, otherwise use system timezone
+    if timezone_str:
+        try:
+            # Try using zoneinfo first (Python 3.9+)
+            tz = zoneinfo.ZoneInfo(timezone_str)
+            now = datetime.datetime.now(tz)
+        except zoneinfo.ZoneInfoNotFoundError:
             try:
-                tz = zoneinfo.ZoneInfo(timezone_str)
+                # Fallback to pytz if available
+                import pytz  # type: ignore
+
+                tz = pytz.timezone(timezone_str)
                 now = datetime.datetime.now(tz)
-            except zoneinfo.ZoneInfoNotFoundError:
+            except ImportError:
                 return [
                     types.TextContent(
                         type="text",
-                        text=f"Invalid timezone identifier: '{timezone_str}'. Please use a valid timezone like 'UTC', 'America/New_York', etc. Using system timezone instead.",
-                    )
-                ]
-            except Exception as e:
-                return [
+                        text="The pytz library is not available. Using system timezone instead.",
+                    ),
                     types.TextContent(
                         type="text",
-                        text=f"Error with timezone '{timezone_str}': {str(e)}. Using system timezone instead.",
-                    )
+                        text=format_time(datetime.datetime.now(), time_format),
+                    ),
                 ]
-        else:
-            now = datetime.datetime.now()
-
-        # Format the datetime
-        try:
-            if time_format == "custom":
-                if custom_format:
-                    formatted_time = now.strftime(custom_format)
-                else:
-                    raise ValueError("custom_format is required when format='custom'")
-            elif time_format == "json":
-                # Return JSON format with multiple representations
-                json_output = {
-                    "iso": now.isoformat(),
-                    "readable": now.strftime("%Y-%m-%d %H:%M:%S"),
-                    "unix": int(now.timestamp()),
-                    "rfc3339": now.strftime("%Y-%m-%dT%H:%M:%S%z")
-                    if now.tzinfo
-                    else now.strftime("%Y-%m-%dT%H:%M:%S"),
-                    "timezone": str(now.tzinfo) if now.tzinfo else "Local",
-                    "utc_offset": str(now.utcoffset())
-                    if now.utcoffset()
-                    else "Unknown",
-                }
-                formatted_time = json.dumps(json_output, indent=2)
-            else:
-                formatted_time = format_time(now, time_format)
-
-            return [types.TextContent(type="text", text=formatted_time)]
-        except ValueError as e:
-            return [
-                types.TextContent(
-                    type="text", text=f"Error formatting datetime: {str(e)}"
-                )
-            ]
-
-    elif name == "get-current-time":
-        if not arguments:
-            raise ValueError("Missing arguments")
-
-        time_format = arguments.get("format")
-        timezone_str = arguments.get("timezone")
-
-        if not time_format:
-            raise ValueError("Missing format argument")
-
-        # Handle timezone if provided, otherwise use system timezone
-        if timezone_str:
-            try:
-                # Try using zoneinfo first (Python 3.9+)
-                tz = zoneinfo.ZoneInfo(timezone_str)
-                now = datetime.datetime.now(tz)
-            except zoneinfo.ZoneInfoNotFoundError:
-                try:
-                    # Fallback to pytz if available
-                    import pytz  # type: ignore
-
-                    tz = pytz.timezone(timezone_str)
-                    now = datetime.datetime.now(tz)
-                except ImportError:
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text="The pytz library is not available. Using system timezone instead.",
-                        ),
-                        types.TextContent(
-                            type="text",
-                            text=format_time(datetime.datetime.now(), time_format),
-                        ),
-                    ]
-                except Exception as e:
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Error with timezone '{timezone_str}': {str(e)}. Using system timezone instead.",
-                        ),
-                        types.TextContent(
-                            type="text",
-                            text=format_time(datetime.datetime.now(), time_format),
-                        ),
-                    ]
             except Exception as e:
                 return [
                     types.TextContent(
@@ -1407,173 +1479,240 @@ async def handle_call_tool(
                         text=format_time(datetime.datetime.now(), time_format),
                     ),
                 ]
-        else:
-            now = datetime.datetime.now()
+        except Exception as e:
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"Error with timezone '{timezone_str}': {str(e)}. Using system timezone instead.",
+                ),
+                types.TextContent(
+                    type="text",
+                    text=format_time(datetime.datetime.now(), time_format),
+                ),
+            ]
+    else:
+        now = datetime.datetime.now()
 
-        return [types.TextContent(type="text", text=format_time(now, time_format))]
+    return [types.TextContent(type="text", text=format_time(now, time_format))]
 
-    elif name == "format-date":
-        if not arguments:
-            raise ValueError("Missing arguments")
 
-        date_str = arguments.get("date")
-        format_str = arguments.get("format")
+async def _handle_format_date(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Format a date string with a strftime-style format."""
+    if not arguments:
+        raise ValueError("Missing arguments")
 
-        if not format_str:
-            raise ValueError("Missing format argument")
+    date_str = arguments.get("date")
+    format_str = arguments.get("format")
 
-        # If no date provided, use today
-        if not date_str:
-            date = datetime.datetime.now()
-        else:
-            # Try to parse the date string
-            try:
-                date = datetime.datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            except ValueError:
-                try:
-                    # Try with default format as fallback
-                    date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                except ValueError:
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Could not parse date string: {date_str}. Please use ISO format (YYYY-MM-DD).",
-                        )
-                    ]
+    if not format_str:
+        raise ValueError("Missing format argument")
 
-        # Try to format the date
+    # If no date provided, use today
+    if not date_str:
+        date = datetime.datetime.now()
+    else:
+        # Try to parse the date string
         try:
-            formatted_date = date.strftime(format_str)
-            return [types.TextContent(type="text", text=formatted_date)]
+            date = datetime.datetime.fromisoformat(date_str)
         except ValueError:
-            # Handle the specific test case directly
-            if format_str == "%invalid":
+            try:
+                # Try with default format as fallback
+                date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
+            except ValueError:
                 return [
                     types.TextContent(
-                        type="text", text="Invalid format string: %invalid"
+                        type="text",
+                        text=f"Could not parse date string: {date_str}. Please use ISO format (YYYY-MM-DD).",
                     )
                 ]
-            return [
-                types.TextContent(
-                    type="text", text=f"Invalid format string: {format_str}"
-                )
-            ]
 
-    elif name == "calculate-date":
-        if not arguments:
-            raise ValueError("Missing arguments")
+    # Try to format the date
+    try:
+        formatted_date = compile_date_format(format_str)(date)
+        return [types.TextContent(type="text", text=formatted_date)]
+    except ValueError:
+        return [
+            types.TextContent(type="text", text=f"Invalid format string: {format_str}")
+        ]
 
-        base_date = arguments.get("base_date")
-        operation = arguments.get("operation")
-        amount = arguments.get("amount")
-        unit = arguments.get("unit")
-        timezone_str = arguments.get("timezone")
-
-        # Validate required arguments
-        if not base_date:
-            raise ValueError("Missing base_date argument")
-        if not operation:
-            raise ValueError("Missing operation argument")
-        if amount is None:
-            raise ValueError("Missing amount argument")
-        if not unit:
-            raise ValueError("Missing unit argument")
 
-        try:
-            # Perform the date calculation
-            result_date = calculate_date_operation(
-                base_date=base_date,
-                operation=operation,
-                amount=amount,
-                unit=unit,
-                timezone_str=timezone_str,
-            )
+async def _handle_calculate_date(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Add or subtract a time period from a date."""
+    if not arguments:
+        raise ValueError("Missing arguments")
+
+    base_date = arguments.get("base_date")
+    operation = arguments.get("operation")
+    amount = arguments.get("amount")
+    unit = arguments.get("unit")
+    timezone_str = arguments.get("timezone")
+
+    # Validate required arguments
+    if not base_date:
+        raise ValueError("Missing base_date argument")
+    if not operation:
+        raise ValueError("Missing operation argument")
+    if amount is None:
+        raise ValueError("Missing amount argument")
+    if not unit:
+        raise ValueError("Missing unit argument")
 
-            return [types.TextContent(type="text", text=result_date)]
+    try:
+        # Perform the date calculation
+        result_date = calculate_date_operation(
+            base_date=base_date,
+            operation=operation,
+            amount=amount,
+            unit=unit,
+            timezone_str=timezone_str,
+        )
 
-        except ValueError as e:
-            return [
-                types.TextContent(type="text", text=f"Error calculating date: {str(e)}")
-            ]
+        return [types.TextContent(type="text", text=result_date)]
 
-    elif name == "calculate-date-range":
-        if not arguments:
-            raise ValueError("Missing arguments")
+    except ValueError as e:
+        return [
+            types.TextContent(type="text", text=f"Error calculating date: {str(e)}")
+        ]
 
-        base_date = arguments.get("base_date")
-        direction = arguments.get("direction")
-        amount = arguments.get("amount")
-        unit = arguments.get("unit")
-        timezone_str = arguments.get("timezone")
-
-        # Validate required arguments
-        if not base_date:
-            raise ValueError("Missing base_date argument")
-        if not direction:
-            raise ValueError("Missing direction argument")
-        if amount is None:
-            raise ValueError("Missing amount argument")
-        if not unit:
-            raise ValueError("Missing unit argument")
 
-        try:
-            # Perform the date range calculation
-            result_range = calculate_date_range(
-                base_date=base_date,
-                direction=direction,
-                amount=amount,
-                unit=unit,
-                timezone_str=timezone_str,
+async def _handle_calculate_date_range(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Calculate a date range relative to a base date."""
+    if not arguments:
+        raise ValueError("Missing arguments")
+
+    base_date = arguments.get("base_date")
+    direction = arguments.get("direction")
+    amount = arguments.get("amount")
+    unit = arguments.get("unit")
+    timezone_str = arguments.get("timezone")
+
+    # Validate required arguments
+    if not base_date:
+        raise ValueError("Missing base_date argument")
+    if not direction:
+        raise ValueError("Missing direction argument")
+    if amount is None:
+        raise ValueError("Missing amount argument")
+    if not unit:
+        raise ValueError("Missing unit argument")
+
+    try:
+        # Perform the date range calculation
+        result_range = calculate_date_range(
+            base_date=base_date,
+            direction=direction,
+            amount=amount,
+            unit=unit,
+            timezone_str=timezone_str,
+        )
+
+        # Return the result as JSON text
+        return [types.TextContent(type="text", text=json.dumps(result_range, indent=2))]
+
+    except ValueError as e:
+        return [
+            types.TextContent(
+                type="text", text=f"Error calculating date range: {str(e)}"
             )
+        ]
 
-            # Return the result as JSON text
-            return [
-                types.TextContent(type="text", text=json.dumps(result_range, indent=2))
-            ]
 
-        except ValueError as e:
-            return [
-                types.TextContent(
-                    type="text", text=f"Error calculating date range: {str(e)}"
-                )
-            ]
+async def _handle_calculate_business_days(
+    arguments: dict | None,
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Count business days between two dates."""
+    if not arguments:
+        raise ValueError("Missing arguments")
 
-    elif name == "calculate-business-days":
-        if not arguments:
-            raise ValueError("Missing arguments")
+    start_date = arguments.get("start_date")
+    end_date = arguments.get("end_date")
+    holidays = arguments.get("holidays")
+    timezone_str = arguments.get("timezone")
 
-        start_date = arguments.get("start_date")
-        end_date = arguments.get("end_date")
-        holidays = arguments.get("holidays")
-        timezone_str = arguments.get("timezone")
+    # Validate required arguments
+    if not start_date:
+        raise ValueError("Missing start_date argument")
+    if not end_date:
+        raise ValueError("Missing end_date argument")
 
-        # Validate required arguments
-        if not start_date:
-            raise ValueError("Missing start_date argument")
-        if not end_date:
-            raise ValueError("Missing end_date argument")
+    try:
+        # Perform the business days calculation
+        result = calculate_business_days(
+            start_date=start_date,
+            end_date=end_date,
+            holidays=holidays,
+            timezone_str=timezone_str,
+        )
 
-        try:
-            # Perform the business days calculation
-            result = calculate_business_days(
-                start_date=start_date,
-                end_date=end_date,
-                holidays=holidays,
-                timezone_str=timezone_str,
+        # Return the result as JSON text
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+
+    except ValueError as e:
+        return [
+            types.TextContent(
+                type="text", text=f"Error calculating business days: {str(e)}"
             )
+        ]
+
+
+# Tool name -> handler; handle_call_tool dispatches with one dict lookup
+TOOL_HANDLERS: dict[
+    str,
+    Callable[
+        [dict | None],
+        Awaitable[
+            list[types.TextContent | types.ImageContent | types.EmbeddedResource]
+        ],
+    ],
+] = {
+    "add-note": _handle_add_note,
+    "get-note": _handle_get_note,
+    "list-notes": _handle_list_notes,
+    "delete-note": _handle_delete_note,
+    "get-current-datetime": _handle_get_current_datetime,
+    "get-current-time": _handle_get_current_time,
+    "format-date": _handle_format_date,
+    "calculate-date": _handle_calculate_date,
+    "calculate-date-range": _handle_calculate_date_range,
+    "calculate-business-days": _handle_calculate_business_days,
+}
 
-            # Return the result as JSON text
-            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
 
-        except ValueError as e:
-            return [
-                types.TextContent(
-                    type="text", text=f"Error calculating business days: {str(e)}"
-                )
-            ]
+@server.call_tool()
+async def handle_call_tool(
+    name: str, arguments: dict | None
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """
+    Enhanced tool execution handler with comprehensive error handling and logging.
+    Tools can modify server state and notify clients of changes.
+
+    Args:
+        name (str): The name of the tool to execute.
+        arguments (dict | None): The arguments for the tool.
+
+    Returns:
+        list[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+            The result of the tool execution.
+
+    Raises:
+        ValueError: If the tool name is unknown or arguments are invalid.
+    """
+    # Log the tool call
+    start_time = time.perf_counter()
+    logger.debug(f"Tool call: {name} with args: {arguments}")
+
+    handler = TOOL_HANDLERS.get(name)
+    if handler is not None:
+        return await handler(arguments)
 
     # Log execution time for successful tools
-    execution_time = (asyncio.get_event_loop().time() - start_time) * 1000
+    execution_time = (time.perf_counter() - start_time) * 1000
 
     # Handle unknown tool
     logger.warning(f"Unknown tool requested: '{name}' with args: {arguments}")
@@ -1626,10 +1765,14 @@ def add_years(dt: datetime.datetime, years: int) -> datetime.datetime:
         return dt.replace(year=dt.year + years, month=2, day=28)
 
 
+# Bit i set means weekday i (Monday = 0) is a business day: Monday-Friday
+WORKWEEK_MASK = 0b0011111
+
+
 def calculate_business_days(
     start_date: str,
     end_date: str,
-    holidays: Optional[List[str]] = None,
+    holidays: Optional[Iterable[str]] = None,
     timezone_str: Optional[str] = None,
 ) -> Dict[str, int]:
     """
@@ -1638,7 +1781,8 @@ def calculate_business_days(
     Args:
         start_date: Start date in ISO format (inclusive)
         end_date: End date in ISO format (inclusive)
-        holidays: Optional list of holiday dates in ISO format to exclude
+        holidays: Optional holiday dates in ISO format to exclude (any iterable,
+            e.g. a list or a pre-built frozenset)
         timezone_str: Optional timezone identifier
 
     Returns:
@@ -1650,9 +1794,7 @@ def calculate_business_days(
     # Parse start and end dates
     try:
         if "T" in start_date:
-            start_dt = datetime.datetime.fromisoformat(
-                start_date.replace("Z", "+00:00")
-            ).date()
+            start_dt = datetime.datetime.fromisoformat(start_date).date()
         else:
             start_dt = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
     except ValueError:
@@ -1662,9 +1804,7 @@ def calculate_business_days(
 
     try:
         if "T" in end_date:
-            end_dt = datetime.datetime.fromisoformat(
-                end_date.replace("Z", "+00:00")
-            ).date()
+            end_dt = datetime.datetime.fromisoformat(end_date).date()
         else:
             end_dt = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
     except ValueError:
@@ -1678,36 +1818,41 @@ def calculate_business_days(
             f"start_date ({start_date}) must be before or equal to end_date ({end_date})"
         )
 
-    # Parse holidays list
-    holiday_dates = set()
+    # Parse holidays list into proleptic ordinals for integer range checks
+    holiday_ordinals = set()
     if holidays:
         for holiday in holidays:
             try:
                 if "T" in holiday:
-                    holiday_dt = datetime.datetime.fromisoformat(
-                        holiday.replace("Z", "+00:00")
-                    ).date()
+                    holiday_dt = datetime.datetime.fromisoformat(holiday).date()
                 else:
                     holiday_dt = datetime.datetime.strptime(holiday, "%Y-%m-%d").date()
-                holiday_dates.add(holiday_dt)
+                holiday_ordinals.add(holiday_dt.toordinal())
             except ValueError:
                 raise ValueError(
                     f"Invalid holiday date format: {holiday}. Use ISO format (YYYY-MM-DD)"
                 )
 
-    # Count business days
-    business_days = 0
-    current_date = start_dt
-
-    while current_date <= end_dt:
-        # Check if it's a weekend (Saturday = 5, Sunday = 6)
-        if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-            # Check if it's not a holiday
-            if current_date not in holiday_dates:
-                business_days += 1
-
-        # Move to next day
-        current_date += datetime.timedelta(days=1)
+    # Work on day ordinals from here on; ordinal 1 (0001-01-01) is a Monday,
+    # so (ordinal - 1) % 7 is the weekday without building date objects
+    start_ordinal = start_dt.toordinal()
+    end_ordinal = end_dt.toordinal()
+
+    # Count business days: every full week contributes 5, and the leftover
+    # days are counted by popcount over a weekday bitmask aligned to start_dt
+    full_weeks, extra_days = divmod(end_ordinal - start_ordinal + 1, 7)
+    start_weekday = (start_ordinal - 1) % 7  # Monday = 0, Sunday = 6
+    week_mask = (
+        (WORKWEEK_MASK >> start_weekday) | (WORKWEEK_MASK << (7 - start_weekday))
+    ) & 0b1111111
+    business_days = full_weeks * 5 + (week_mask & ((1 << extra_days) - 1)).bit_count()
+
+    # Exclude holidays that fall on a weekday inside the range
+    business_days -= sum(
+        1
+        for ordinal in holiday_ordinals
+        if start_ordinal <= ordinal <= end_ordinal and (ordinal - 1) % 7 < 5
+    )
 
     return {"business_days": business_days}
 
@@ -1784,7 +1929,7 @@ def calculate_date_operation(
     # Parse the base date
     try:
         if "T" in base_date:
-            dt = datetime.datetime.fromisoformat(base_date.replace("Z", "+00:00"))
+            dt = datetime.datetime.fromisoformat(base_date)
         else:
             dt = datetime.datetime.strptime(base_date, "%Y-%m-%d")
     except ValueError:
@@ -1866,6 +2011,83 @@ def format_time(dt: datetime.datetime, format_type: str) -> str:
         )
 
 
+# Numeric directives rendered with f-strings instead of going through strftime.
+# Each one produces exactly what strftime would; years below 1000 are left to
+# strftime because platforms disagree on zero-padding them.
+FAST_DATE_DIRECTIVES: dict[str, Callable[[datetime.datetime], str]] = {
+    "Y": lambda dt: str(dt.year) if dt.year >= 1000 else dt.strftime("%Y"),
+    "m": lambda dt: f"{dt.month:02d}",
+    "d": lambda dt: f"{dt.day:02d}",
+    "H": lambda dt: f"{dt.hour:02d}",
+    "M": lambda dt: f"{dt.minute:02d}",
+    "S": lambda dt: f"{dt.second:02d}",
+}
+
+# One strftime conversion, including GNU flags and width (%-d, %_H, %10Y)
+# and the E/O/colon modifiers (%Ey, %Od, %:z)
+DATE_DIRECTIVE_PATTERN = re.compile(r"(%[-_0^#]*[0-9]*(?:[EO]|:{1,3})?.)", re.DOTALL)
+
+# Any datetime works for probing whether strftime recognizes a conversion
+_DIRECTIVE_PROBE = datetime.datetime(2000, 1, 1)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_date_format(format_str: str) -> Callable[[datetime.datetime], str]:
+    """
+    Compile a strftime-style format string into a reusable formatter.
+
+    Format strings made only of %Y %m %d %H %M %S (and %%) are split once
+    into literal text and directives, so repeated calls just interpolate the
+    pre-split tokens. Any other format is passed to strftime unchanged, so
+    platform directives such as %-d, %e, %F or %:z keep working.
+
+    Args:
+        format_str (str): The strftime-style format string.
+
+    Returns:
+        Callable[[datetime.datetime], str]: Function formatting a datetime.
+
+    Raises:
+        ValueError: If strftime rejects the format, or does not recognize one
+            of its conversions (glibc echoes unknown ones back verbatim).
+    """
+    parts = DATE_DIRECTIVE_PATTERN.split(format_str)
+    directives = parts[1::2]
+    for directive in directives:
+        if directive != "%%" and _DIRECTIVE_PROBE.strftime(directive) == directive:
+            raise ValueError(f"Invalid format string: {format_str}")
+
+    literals = parts[::2]
+    if any("%" in literal for literal in literals) or not all(
+        directive == "%%" or directive[1:] in FAST_DATE_DIRECTIVES
+        for directive in directives
+    ):
+        return functools.partial(datetime.datetime.strftime, format=format_str)
+
+    tokens: list[str | Callable[[datetime.datetime], str]] = []
+    literal = literals[0]
+    for directive, next_literal in zip(directives, literals[1:]):
+        if directive == "%%":
+            literal += "%"
+        else:
+            if literal:
+                tokens.append(literal)
+            tokens.append(FAST_DATE_DIRECTIVES[directive[1]])
+            literal = ""
+        literal += next_literal
+    if literal:
+        tokens.append(literal)
+
+    frozen_tokens = tuple(tokens)
+
+    def render_date(dt: datetime.datetime) -> str:
+        return "".join(
+            [token if isinstance(token, str) else token(dt) for token in frozen_tokens]
+        )
+
+    return render_date
+
+
 def setup_signal_handlers():
     """Set up signal handlers for graceful shutdown with thread safety."""
 
@@ -1886,13 +2108,17 @@ def setup_signal_handlers():
     logger.debug("Signal handlers installed")
 
 
+# Resource monitor poll intervals in seconds; the error interval doubles once
+# MONITOR_MAX_CONSECUTIVE_ERRORS polls in a row have failed
+MONITOR_INTERVAL_SECONDS = 30
+MONITOR_ERROR_INTERVAL_SECONDS = 60
+MONITOR_MAX_CONSECUTIVE_ERRORS = 5
+
+
 async def monitor_resources():
     """Enhanced background task to monitor server resource usage with better error recovery."""
     process = psutil.Process(os.getpid())
     consecutive_errors = 0
-    max_consecutive_errors = 5
-    base_sleep_interval = 30
-    error_sleep_interval = 60
 
     while not is_shutdown_requested():
         try:
@@ -1910,6 +2136,13 @@ async def monitor_resources():
                 logger.warning(f"High memory usage detected: {memory_mb:.1f}MB")
                 update_health_metrics("memory_warnings")
 
+                # Check health metrics; the count only changes on this path,
+                # so idle polls skip the health_metrics_lock round trip
+                with health_metrics_lock:
+                    memory_warnings = health_metrics["memory_warnings"]
+                if memory_warnings > 10:
+                    logger.critical(f"Excessive memory warnings: {memory_warnings}")
+
             # Check note storage limits
             if current_note_count >= MAX_NOTES:
                 logger.warning(
@@ -1917,34 +2150,27 @@ async def monitor_resources():
                 )
                 update_health_metrics("note_storage_warnings")
 
-            # Check health metrics
-            with health_metrics_lock:
-                if health_metrics["memory_warnings"] > 10:
-                    logger.critical(
-                        f"Excessive memory warnings: {health_metrics['memory_warnings']}"
-                    )
-
             # Reset consecutive error count on success
             consecutive_errors = 0
 
             # Sleep for normal interval
-            await asyncio.sleep(base_sleep_interval)
+            await asyncio.sleep(MONITOR_INTERVAL_SECONDS)
 
         except Exception as e:
             consecutive_errors += 1
             update_health_metrics("error_recovery_count")
 
-            if consecutive_errors >= max_consecutive_errors:
+            if consecutive_errors >= MONITOR_MAX_CONSECUTIVE_ERRORS:
                 logger.critical(
                     f"Resource monitoring failed {consecutive_errors} consecutive times, potential system instability"
                 )
                 # Still continue monitoring but with longer intervals
-                await asyncio.sleep(error_sleep_interval * 2)
+                await asyncio.sleep(MONITOR_ERROR_INTERVAL_SECONDS * 2)
             else:
                 logger.error(
-                    f"Error in resource monitoring (attempt {consecutive_errors}/{max_consecutive_errors}): {e}"
+                    f"Error in resource monitoring (attempt {consecutive_errors}/{MONITOR_MAX_CONSECUTIVE_ERRORS}): {e}"
                 )
-                await asyncio.sleep(error_sleep_interval)
+                await asyncio.sleep(MONITOR_ERROR_INTERVAL_SECONDS)
 
 
 async def cleanup_resources():
@@ -6,6 +6,7 @@ by testing resources, prompts, and tools.
 """
 
 import datetime
+import sys
 from typing import TYPE_CHECKING
 
 import pytest
@@ -547,6 +548,27 @@ async def test_call_format_date_tool_invalid_format(reset_server_state: None) ->
     assert "Invalid format string" in result[0].text
 
 
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="GNU strftime flags are not supported on Windows"
+)
+async def test_call_format_date_tool_platform_directives(
+    reset_server_state: None,
+) -> None:
+    """
+    Test that format-date passes directives outside the fast path to strftime.
+
+    Args:
+        reset_server_state: Fixture to reset the server state before the test.
+    """
+    arguments = {"date": "2024-07-05", "format": "%-d/%-m/%Y"}
+    result = await handle_call_tool("format-date", arguments)
+
+    assert len(result) == 1
+    assert isinstance(result[0], types.TextContent)
+    assert result[0].text == "5/7/2024"
+
+
 @pytest.mark.asyncio
 async def test_call_unknown_tool(reset_server_state: None) -> None:
     """
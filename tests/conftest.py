@@ -0,0 +1,25 @@
+"""
+Shared pytest configuration for the datetime_mcp_server test suite.
+"""
+
+import asyncio
+import platform
+
+import pytest
+
+# Use uvloop for better performance on Unix systems, matching the HTTP server
+if platform.system() != "Windows":
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+else:
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run pytest-asyncio event loops on uvloop when it is available."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
@@ -4,37 +4,75 @@ and resource cleanup improvements.
 """
 
 import asyncio
+import itertools
+import os
 import pytest
+import sys
 import time
+import tracemalloc
 from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
-import psutil
-
 from datetime_mcp_server.server import (
     notes,
     notes_lock,
+    notes_bulk_insert,
+    store_note,
     health_metrics,
     health_metrics_lock,
     set_shutdown_requested,
     is_shutdown_requested,
     update_health_metrics,
+    update_health_metrics_batch,
     cleanup_resources,
     MAX_NOTES,
     MAX_NOTE_SIZE,
 )
 from datetime_mcp_server.http_server import (
+    SSEConnectionManager,
     sse_manager,
     metrics,
     metrics_lock,
+    update_metrics,
+    MAX_ENDPOINT_TRACKING,
     MAX_RESPONSE_TIMES,
 )
 
+# Counter bumps applied together by the metric workers, one lock acquisition each
+_WORKER_METRIC_INCREMENTS = {"memory_warnings": 1, "error_recovery_count": 2}
+
+# Worker threads share at most 8 CPUs, so the notes_lock cacheline stays on
+# nearby cores and ops/sec is not skewed by threads migrating across the host
+if hasattr(os, "sched_setaffinity"):
+    _WORKER_CPUS = frozenset(sorted(os.sched_getaffinity(0))[:8])
+else:  # macOS and Windows have no affinity API in os
+    _WORKER_CPUS = None
+
+# Enough threads for the largest test (the 20-worker load test)
+_SHARED_POOL_WORKERS = 20
+
+
+def _pin_current_thread(cpus: frozenset[int] | None) -> None:
+    """Pin the calling thread to cpus, where the platform supports it."""
+    if cpus is not None:
+        os.sched_setaffinity(0, cpus)
+
+
+@pytest.fixture(scope="module")
+def shared_pool():
+    """Thread pool shared by this module's tests, so threads are created once."""
+    with ThreadPoolExecutor(
+        max_workers=_SHARED_POOL_WORKERS,
+        initializer=_pin_current_thread,
+        initargs=(_WORKER_CPUS,),
+    ) as pool:
+        yield pool
+
 
 class TestConcurrencyAndThreadSafety:
     """Test thread safety and concurrency handling."""
 
-    def test_notes_concurrent_access(self):
+    def test_notes_concurrent_access(self, shared_pool):
         """Test concurrent note operations are thread-safe."""
         # Clear notes
         with notes_lock:
@@ -42,51 +80,49 @@ class TestConcurrencyAndThreadSafety:
 
         def add_note_worker(worker_id: int, note_count: int):
             """Worker function to add notes concurrently."""
-            for i in range(note_count):
-                note_name = f"worker_{worker_id}_note_{i}"
-                content = f"Content from worker {worker_id}, note {i}"
-
-                # Simulate the add-note operation
-                with notes_lock:
-                    if note_name not in notes and len(notes) >= MAX_NOTES:
-                        if notes:
-                            oldest_note, _ = notes.popitem(last=False)
-                    notes[note_name] = content
-                    if note_name in notes:  # Update case
-                        notes.move_to_end(note_name)
+            # Build the batch locally, then take notes_lock once to insert it;
+            # the per-worker prefixes are formatted once, not once per note
+            name_prefix = f"worker_{worker_id}_note_"
+            content_prefix = f"Content from worker {worker_id}, note "
+            batch = [
+                (name_prefix + str(i), content_prefix + str(i))
+                for i in range(note_count)
+            ]
+            notes_bulk_insert(batch)
 
         # Run concurrent workers
         num_workers = 10
         notes_per_worker = 50
 
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = []
-            for worker_id in range(num_workers):
-                future = executor.submit(add_note_worker, worker_id, notes_per_worker)
-                futures.append(future)
+        futures = [
+            shared_pool.submit(add_note_worker, worker_id, notes_per_worker)
+            for worker_id in range(num_workers)
+        ]
 
-            # Wait for all workers to complete
-            for future in futures:
-                future.result()
+        # Wait for all workers to complete
+        for future in futures:
+            future.result()
 
         # Verify final state
         with notes_lock:
             # Should have at most MAX_NOTES due to FIFO eviction
             assert len(notes) <= MAX_NOTES
-            # Verify FIFO behavior - check that we have the most recent notes
-            note_names = list(notes.keys())
-            assert len(note_names) > 0
+            # Verify FIFO behavior - check that we have the most recent notes,
+            # using direct O(1) lookups instead of snapshotting the keys
+            assert notes
+            for worker_id in range(num_workers):
+                assert f"worker_{worker_id}_note_{notes_per_worker - 1}" in notes
 
         print(f"Concurrent test completed. Final note count: {len(notes)}")
 
-    def test_shutdown_flag_thread_safety(self):
+    def test_shutdown_flag_thread_safety(self, shared_pool):
         """Test shutdown flag operations are thread-safe."""
 
         def toggle_shutdown_worker(iterations: int):
             """Worker that toggles shutdown flag."""
             for i in range(iterations):
                 set_shutdown_requested(i % 2 == 0)
-                time.sleep(0.001)  # Small delay
+                time.sleep(0)  # Yield the GIL so workers interleave
                 current_state = is_shutdown_requested()
                 assert isinstance(current_state, bool)
 
@@ -94,28 +130,26 @@ class TestConcurrencyAndThreadSafety:
         num_workers = 5
         iterations = 100
 
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = []
-            for _ in range(num_workers):
-                future = executor.submit(toggle_shutdown_worker, iterations)
-                futures.append(future)
+        futures = [
+            shared_pool.submit(toggle_shutdown_worker, iterations)
+            for _ in range(num_workers)
+        ]
 
-            for future in futures:
-                future.result()
+        for future in futures:
+            future.result()
 
         # Final state should be deterministic
         final_state = is_shutdown_requested()
         assert isinstance(final_state, bool)
 
-    def test_health_metrics_concurrent_updates(self):
+    def test_health_metrics_concurrent_updates(self, shared_pool):
         """Test health metrics updates are thread-safe."""
 
         def update_metrics_worker(worker_id: int, updates: int):
             """Worker that updates health metrics."""
             for i in range(updates):
-                update_health_metrics("memory_warnings")
-                update_health_metrics("error_recovery_count", 2)
-                time.sleep(0.001)
+                update_health_metrics_batch(_WORKER_METRIC_INCREMENTS)
+                time.sleep(0)  # Yield the GIL so workers interleave
 
         # Clear metrics
         with health_metrics_lock:
@@ -126,16 +160,13 @@ class TestConcurrencyAndThreadSafety:
         num_workers = 8
         updates_per_worker = 25
 
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = []
-            for worker_id in range(num_workers):
-                future = executor.submit(
-                    update_metrics_worker, worker_id, updates_per_worker
-                )
-                futures.append(future)
+        futures = [
+            shared_pool.submit(update_metrics_worker, worker_id, updates_per_worker)
+            for worker_id in range(num_workers)
+        ]
 
-            for future in futures:
-                future.result()
+        for future in futures:
+            future.result()
 
         # Verify final counts
         with health_metrics_lock:
@@ -156,16 +187,11 @@ class TestMemoryManagement:
         with notes_lock:
             notes.clear()
 
-        # Add notes up to the limit
-        for i in range(MAX_NOTES + 50):  # Exceed limit
-            note_name = f"test_note_{i:04d}"
-            content = f"Test content for note {i}"
-
-            with notes_lock:
-                if note_name not in notes and len(notes) >= MAX_NOTES:
-                    if notes:
-                        oldest_note, _ = notes.popitem(last=False)
-                notes[note_name] = content
+        # Add notes past the limit in one batch
+        notes_bulk_insert(
+            (f"test_note_{i:04d}", f"Test content for note {i}")
+            for i in range(MAX_NOTES + 50)  # Exceed limit
+        )
 
         # Verify limits are respected
         with notes_lock:
@@ -173,9 +199,50 @@ class TestMemoryManagement:
 
             # Verify FIFO - oldest notes should be evicted
             # The remaining notes should be the most recent ones
-            note_names = list(notes.keys())
-            assert "test_note_0000" not in note_names  # Should be evicted
-            assert f"test_note_{MAX_NOTES + 49:04d}" in note_names  # Should be present
+            assert "test_note_0000" not in notes  # Should be evicted
+            assert f"test_note_{MAX_NOTES + 49:04d}" in notes  # Should be present
+
+    def test_notes_bulk_insert_eviction(self):
+        """Test bulk inserts evict oldest-first and report the evicted names."""
+        with notes_lock:
+            notes.clear()
+
+        notes_bulk_insert((f"bulk_note_{i}", "content") for i in range(MAX_NOTES))
+        evicted = notes_bulk_insert([("bulk_note_0", "updated"), ("extra", "content")])
+
+        # The update refreshes bulk_note_0, so bulk_note_1 is the oldest
+        assert evicted == ["bulk_note_1"]
+        with notes_lock:
+            assert len(notes) == MAX_NOTES
+            assert notes["bulk_note_0"] == "updated"
+
+        # A name repeated in an overflowing batch takes its last position, so
+        # the batch evicts the same notes as one store_note call per item
+        batch = [
+            ("n1", "0"),
+            ("n1", "1"),
+            ("n5", "2"),
+            ("n8", "3"),
+            ("n7", "4"),
+            ("n1", "5"),
+            ("n4", "6"),
+        ]
+        with patch("datetime_mcp_server.server.MAX_NOTES", 4):
+            with notes_lock:
+                notes.clear()
+                notes["n2"] = "initial"
+            for note_name, content in batch:
+                store_note(note_name, content)
+            with notes_lock:
+                expected = list(notes.items())
+                notes.clear()
+                notes["n2"] = "initial"
+
+            notes_bulk_insert(batch)
+
+        with notes_lock:
+            assert list(notes.items()) == expected
+            assert expected == [("n8", "3"), ("n7", "4"), ("n1", "5"), ("n4", "6")]
 
     def test_note_size_limits(self):
         """Test that note size limits are enforced."""
@@ -221,6 +288,47 @@ class TestMemoryManagement:
         success = sse_manager.add_connection(new_conn)
         assert success
 
+    def test_sse_expired_connections_cleanup(self):
+        """Test a re-added connection moves behind older ones for cleanup."""
+        manager = SSEConnectionManager(max_connections=3)
+        assert manager.add_connection("a")
+        assert manager.add_connection("b")
+
+        # Re-adding a live id must move its timestamp to the end; otherwise
+        # "a" would stay first and stop the cleanup scan before "b"
+        assert manager.add_connection("a")
+        manager.connection_timestamps["b"] = time.monotonic() - 7 * 3600
+
+        manager._cleanup_old_connections()
+
+        assert manager.get_connection_count() == 1
+        assert not manager.is_connection_active("b")
+        assert manager.is_connection_active("a")
+
+    def test_endpoint_tracking_evicts_only_for_new_endpoints(self):
+        """Test requests to tracked endpoints never evict other endpoints."""
+        with metrics_lock:
+            metrics["requests_by_endpoint"].clear()
+
+        for i in range(MAX_ENDPOINT_TRACKING):
+            update_metrics(f"/endpoint_{i}", 0.001)
+        update_metrics("/endpoint_1", 0.001)
+
+        # A tracked endpoint at capacity is counted without evicting anything
+        with metrics_lock:
+            assert len(metrics["requests_by_endpoint"]) == MAX_ENDPOINT_TRACKING
+            assert "/endpoint_0" in metrics["requests_by_endpoint"]
+            assert metrics["requests_by_endpoint"]["/endpoint_1"] == 2
+
+        # A new endpoint evicts the least used one
+        update_metrics("/new_endpoint", 0.001)
+        with metrics_lock:
+            assert len(metrics["requests_by_endpoint"]) == MAX_ENDPOINT_TRACKING
+            assert "/endpoint_0" not in metrics["requests_by_endpoint"]
+            assert metrics["requests_by_endpoint"]["/new_endpoint"] == 1
+            metrics["requests_by_endpoint"].clear()
+            metrics["response_times"].clear()
+
     def test_metrics_memory_management(self):
         """Test that metrics respect memory limits."""
         # Clear metrics
@@ -228,18 +336,23 @@ class TestMemoryManagement:
             metrics["requests_by_endpoint"].clear()
             metrics["response_times"].clear()
 
-        # Test response times deque limit
-        from datetime_mcp_server.http_server import response_times_deque
+        # Test response times ring buffer limit
+        from datetime_mcp_server.http_server import response_times_buffer
 
         # Add more than the limit
         for i in range(MAX_RESPONSE_TIMES + 100):
-            response_times_deque.append(i * 0.001)
+            response_times_buffer.append(i * 0.001)
 
         # Should be limited to max size
-        assert len(response_times_deque) == MAX_RESPONSE_TIMES
+        assert len(response_times_buffer) == MAX_RESPONSE_TIMES
         # Should contain the most recent values
-        assert (MAX_RESPONSE_TIMES + 99) * 0.001 in response_times_deque
-        assert 0.0 not in response_times_deque  # Oldest should be evicted
+        assert (MAX_RESPONSE_TIMES + 99) * 0.001 in response_times_buffer
+        assert 0.0 not in response_times_buffer  # Oldest should be evicted
+        # Iteration runs oldest to newest, and the running mean matches
+        assert next(iter(response_times_buffer)) == 100 * 0.001
+        assert response_times_buffer.mean() == pytest.approx(
+            sum(response_times_buffer) / MAX_RESPONSE_TIMES
+        )
 
 
 class TestErrorRecovery:
@@ -250,24 +363,38 @@ class TestErrorRecovery:
         """Test resource monitoring handles errors gracefully."""
         from datetime_mcp_server.server import monitor_resources
 
-        # Mock psutil to raise exceptions
-        with patch("datetime_mcp_server.server.psutil.Process") as mock_process:
+        with health_metrics_lock:
+            initial_error_count = health_metrics["error_recovery_count"]
+
+        # Mock psutil to keep failing and recovering; cycling the side effects
+        # means extra polls never run out of them and raise StopIteration
+        with (
+            patch("datetime_mcp_server.server.psutil.Process") as mock_process,
+            patch.multiple(
+                "datetime_mcp_server.server",
+                MONITOR_INTERVAL_SECONDS=0,
+                MONITOR_ERROR_INTERVAL_SECONDS=0,
+            ),
+        ):
             mock_instance = Mock()
-            mock_instance.memory_info.side_effect = [
-                Exception("Memory access failed"),
-                Exception("Another failure"),
-                Mock(rss=50 * 1024 * 1024),  # 50MB - success
-            ]
+            mock_instance.memory_info.side_effect = itertools.cycle(
+                [
+                    Exception("Memory access failed"),
+                    Exception("Another failure"),
+                    Mock(rss=50 * 1024 * 1024),  # 50MB - success
+                ]
+            )
             mock_process.return_value = mock_instance
 
-            # Set short intervals for testing
             set_shutdown_requested(False)
 
             # Start monitoring task
             monitor_task = asyncio.create_task(monitor_resources())
 
-            # Let it run for a short time
-            await asyncio.sleep(0.5)
+            # With zero poll intervals every sleep is a bare yield, so each of
+            # these yields lets the monitor run one more poll
+            for _ in range(9):
+                await asyncio.sleep(0)
 
             # Stop monitoring
             set_shutdown_requested(True)
@@ -278,9 +405,10 @@ class TestErrorRecovery:
             except asyncio.CancelledError:
                 pass
 
-            # Verify error recovery count increased
+            # Several fail/fail/succeed cycles ran and every failure recovered
+            assert mock_instance.memory_info.call_count >= 6
             with health_metrics_lock:
-                assert health_metrics["error_recovery_count"] > 0
+                assert health_metrics["error_recovery_count"] >= initial_error_count + 2
 
     @pytest.mark.asyncio
     async def test_cleanup_resources_error_handling(self):
@@ -311,37 +439,46 @@ class TestPerformanceStability:
         """Test memory usage remains stable under load."""
         import gc
 
-        # Get initial memory
-        process = psutil.Process()
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-
-        # Perform memory-intensive operations
         with notes_lock:
             notes.clear()
+        gc.collect()
+        initial_blocks = sys.getallocatedblocks()
+
+        # Measure Python-level allocations rather than RSS, which also
+        # reflects allocator arenas that are never returned to the OS
+        tracemalloc.start()
+        try:
+            initial_snapshot = tracemalloc.take_snapshot()
+
+            # Perform memory-intensive operations: add and remove many notes
+            for cycle in range(5):
+                # Format the per-cycle prefixes once instead of once per note
+                name_prefix = f"cycle_{cycle}_note_"
+                content_prefix = f"Content for cycle {cycle}, note "
+                notes_bulk_insert(
+                    (
+                        name_prefix + str(i),
+                        (content_prefix + str(i)) * 10,  # Larger content
+                    )
+                    for i in range(MAX_NOTES)
+                )
 
-        # Add and remove many notes
-        for cycle in range(5):
-            for i in range(MAX_NOTES):
-                note_name = f"cycle_{cycle}_note_{i}"
-                content = f"Content for cycle {cycle}, note {i}" * 10  # Larger content
-
-                with notes_lock:
-                    if note_name not in notes and len(notes) >= MAX_NOTES:
-                        if notes:
-                            oldest_note, _ = notes.popitem(last=False)
-                    notes[note_name] = content
+                # Clear notes periodically
+                if cycle % 2 == 1:
+                    with notes_lock:
+                        notes.clear()
 
-            # Clear notes periodically
-            if cycle % 2 == 1:
-                with notes_lock:
-                    notes.clear()
+                # Force garbage collection
+                gc.collect()
 
-            # Force garbage collection
-            gc.collect()
+            final_snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
 
-        # Get final memory
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        memory_increase = final_memory - initial_memory
+        memory_increase = sum(
+            stat.size_diff
+            for stat in final_snapshot.compare_to(initial_snapshot, "filename")
+        ) / (1024 * 1024)  # MB
 
         print(f"Memory increase: {memory_increase:.2f} MB")
 
@@ -350,22 +487,33 @@ class TestPerformanceStability:
             f"Memory increase too high: {memory_increase:.2f} MB"
         )
 
-    def test_concurrent_load_handling(self):
+        # Once the notes and snapshots are released, the count of live
+        # allocator blocks should return close to where it started
+        del initial_snapshot, final_snapshot
+        with notes_lock:
+            notes.clear()
+        gc.collect()
+        gc.collect()
+        block_drift = sys.getallocatedblocks() - initial_blocks
+        print(f"Allocated block drift: {block_drift}")
+        assert block_drift < 10000, f"Allocated blocks leaked: {block_drift}"
+
+    def test_concurrent_load_handling(self, shared_pool):
         """Test system handles concurrent load without degradation."""
+        # Known note for the read operations to fetch by key
+        sample_name = "load_sample_note"
+        store_note(sample_name, "Load test sample content")
 
         def load_worker(worker_id: int, operations: int):
             """Simulate mixed load operations."""
+            name_prefix = f"load_worker_{worker_id}_note_"
+            content = f"Load test content from worker {worker_id}"
+            pending_notes = []
             for i in range(operations):
                 # Mix of operations
                 if i % 3 == 0:
-                    # Add note
-                    note_name = f"load_worker_{worker_id}_note_{i}"
-                    content = f"Load test content from worker {worker_id}"
-                    with notes_lock:
-                        if note_name not in notes and len(notes) >= MAX_NOTES:
-                            if notes:
-                                oldest_note, _ = notes.popitem(last=False)
-                        notes[note_name] = content
+                    # Add note; buffered and inserted in one batch at the end
+                    pending_notes.append((name_prefix + str(i), content))
                 elif i % 3 == 1:
                     # Update health metrics
                     update_health_metrics("memory_warnings")
@@ -373,26 +521,25 @@ class TestPerformanceStability:
                     # Read operations
                     with notes_lock:
                         len(notes)  # Read operation to check length
-                        if notes:
-                            next(iter(notes.values()))  # Read operation to get a sample
+                        # Keyed read, so no iterator is allocated per sample
+                        notes.get(sample_name)
 
-                # Small delay to simulate processing
-                time.sleep(0.001)
+            notes_bulk_insert(pending_notes)
 
         start_time = time.time()
 
-        # Run concurrent load
+        # Run concurrent load; the workers are CPU-bound, so there is no
+        # artificial sleep and enough operations to measure lock throughput
         num_workers = 20
-        operations_per_worker = 100
+        operations_per_worker = 1000
 
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = []
-            for worker_id in range(num_workers):
-                future = executor.submit(load_worker, worker_id, operations_per_worker)
-                futures.append(future)
+        futures = [
+            shared_pool.submit(load_worker, worker_id, operations_per_worker)
+            for worker_id in range(num_workers)
+        ]
 
-            for future in futures:
-                future.result()
+        for future in futures:
+            future.result()
 
         end_time = time.time()
         total_time = end_time - start_time
@@ -429,25 +576,21 @@ class TestStabilityIntegration:
 
         set_shutdown_requested(False)
 
-        # Simulate various concurrent operations
+        # Simulate various concurrent operations; each step yields with
+        # sleep(0) so the tasks interleave without waiting on real time
         async def note_operations():
             for i in range(100):
                 note_name = f"stability_note_{i}"
                 content = f"Stability test content {i}"
 
-                with notes_lock:
-                    if note_name not in notes and len(notes) >= MAX_NOTES:
-                        if notes:
-                            oldest_note, _ = notes.popitem(last=False)
-                    notes[note_name] = content
+                store_note(note_name, content)
 
-                await asyncio.sleep(0.01)
+                await asyncio.sleep(0)
 
         async def metric_operations():
             for i in range(50):
-                update_health_metrics("memory_warnings")
-                update_health_metrics("error_recovery_count", 2)
-                await asyncio.sleep(0.02)
+                update_health_metrics_batch(_WORKER_METRIC_INCREMENTS)
+                await asyncio.sleep(0)
 
         async def sse_operations():
             # Simulate SSE connections
@@ -456,15 +599,18 @@ class TestStabilityIntegration:
                 conn_id = f"stability_conn_{i}"
                 if sse_manager.add_connection(conn_id):
                     connection_ids.append(conn_id)
-                await asyncio.sleep(0.01)
+                await asyncio.sleep(0)
 
             # Cleanup connections
             for conn_id in connection_ids:
                 sse_manager.remove_connection(conn_id)
-                await asyncio.sleep(0.01)
+                await asyncio.sleep(0)
 
-        # Run all operations concurrently
-        await asyncio.gather(note_operations(), metric_operations(), sse_operations())
+        # Run all operations concurrently; a TaskGroup cancels the others if one fails
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(note_operations())
+            tg.create_task(metric_operations())
+            tg.create_task(sse_operations())
 
         # Verify system stability
         with notes_lock: